@@ -12,16 +12,46 @@
 # language governing permissions and limitations under the License.
 
 import logging
-import httplib
-import re
-import sys
+import os
 import time
 from validation import validateResponse, validateContext
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# set the LOG_LEVEL environment variable (e.g. WARNING) to turn off the per-request logs
+LOG_LEVELS = ('DEBUG','INFO','WARNING','ERROR','CRITICAL')
+log_level = (os.environ.get('LOG_LEVEL') or 'INFO').strip().upper()
+if log_level not in LOG_LEVELS:
+    logger.warning('Unknown LOG_LEVEL %r, using INFO (expected one of %s)',log_level,', '.join(LOG_LEVELS))
+    log_level = 'INFO'
+logger.setLevel(log_level)
 
 SAMPLE_MANUFACTURER = 'Sample Manufacturer'
+
+# action lists shared by the sample appliances
+_SWITCH_ACTIONS = ('turnOn','turnOff')
+_PERCENTAGE_ACTIONS = _SWITCH_ACTIONS + ('setPercentage','incrementPercentage','decrementPercentage')
+_LIGHT_ACTIONS = _PERCENTAGE_ACTIONS + ('setColor','setColorTemperature','incrementColorTemperature','decrementColorTemperature')
+_TARGET_TEMPERATURE_ACTIONS = ('setTargetTemperature','incrementTargetTemperature','decrementTargetTemperature')
+_THERMOSTAT_ACTIONS = _TARGET_TEMPERATURE_ACTIONS + ('getTargetTemperature','getTemperatureReading')
+_LOCK_ACTIONS = ('setLockState','getLockState')
+
+# the thermostats only differ by mode, as (applianceId, friendlyName, mode)
+_SAMPLE_THERMOSTATS = [
+    ('ThermostatAuto-001','Family Room','AUTO'),
+    ('ThermostatHeat-001','Guestroom','HEAT'),
+    ('ThermostatCool-001','Hallway','COOL'),
+    ('ThermostatEco-001','Kitchen','ECO'),
+    ('ThermostatCustom-001','Laundry Room','CUSTOM'),
+    ('ThermostatOff-001','Living Room','OFF'),
+]
+
+_THERMOSTAT_MODES = {appliance_id: mode for appliance_id, friendly_name, mode in _SAMPLE_THERMOSTATS}
+
+# temperatures reported by the sample thermostats
+PREVIOUS_TEMPERATURE = 21.0
+MINIMUM_TEMPERATURE = 5.0
+MAXIMUM_TEMPERATURE = 30.0
+
 SAMPLE_APPLIANCES = [
     {
         'applianceId': 'Switch-001',
@@ -31,10 +61,7 @@ SAMPLE_APPLIANCES = [
         'friendlyName': 'Switch',
         'friendlyDescription': 'On/off switch that is functional and reachable',
         'isReachable': True,
-        'actions': [
-            'turnOn',
-            'turnOff',
-        ],
+        'actions': list(_SWITCH_ACTIONS),
         'additionalApplianceDetails': {}        
     },
     {
@@ -45,17 +72,7 @@ SAMPLE_APPLIANCES = [
         'friendlyName': 'Upstairs Light',
         'friendlyDescription': 'Light that is functional (brightness, color, color temperature) and reachable',
         'isReachable': True,
-        'actions': [
-            'turnOn',
-            'turnOff',
-            'setPercentage',
-            'incrementPercentage',
-            'decrementPercentage',
-            'setColor',
-            'setColorTemperature',
-            'incrementColorTemperature',
-            'decrementColorTemperature',
-        ],
+        'actions': list(_LIGHT_ACTIONS),
         'additionalApplianceDetails': {}        
     },
     {
@@ -66,13 +83,7 @@ SAMPLE_APPLIANCES = [
         'friendlyName': 'Upstairs Fan',
         'friendlyDescription': 'Fan that is functional and reachable',
         'isReachable': True,
-        'actions': [
-            'turnOn',
-            'turnOff',
-            'setPercentage',
-            'incrementPercentage',
-            'decrementPercentage',
-        ],
+        'actions': list(_PERCENTAGE_ACTIONS),
         'additionalApplianceDetails': {}        
     },
     {
@@ -83,114 +94,23 @@ SAMPLE_APPLIANCES = [
         'friendlyName': 'Switch Unreachable',
         'friendlyDescription': 'Switch that is unreachable and shows (Offline)',
         'isReachable': False,
-        'actions': [
-            'turnOn',
-            'turnOff',
-        ],
-        'additionalApplianceDetails': {}
-    },
-    {
-        'applianceId': 'ThermostatAuto-001',
-        'manufacturerName': SAMPLE_MANUFACTURER,
-        'modelName': 'Thermostat',
-        'version': '1',
-        'friendlyName': 'Family Room',
-        'friendlyDescription': 'Thermostat in AUTO mode and reachable',
-        'isReachable': True,
-        'actions': [
-            'setTargetTemperature',
-            'incrementTargetTemperature',
-            'decrementTargetTemperature',
-            'getTargetTemperature',
-            'getTemperatureReading',            
-        ],
-        'additionalApplianceDetails': {}
-    },
-    {
-        'applianceId': 'ThermostatHeat-001',
-        'manufacturerName': SAMPLE_MANUFACTURER,
-        'modelName': 'Thermostat',
-        'version': '1',
-        'friendlyName': 'Guestroom',
-        'friendlyDescription': 'Thermostat in HEAT mode and reachable',
-        'isReachable': True,
-        'actions': [
-            'setTargetTemperature',
-            'incrementTargetTemperature',
-            'decrementTargetTemperature',
-            'getTargetTemperature',
-            'getTemperatureReading',            
-        ],
-        'additionalApplianceDetails': {}
-    },
-    {
-        'applianceId': 'ThermostatCool-001',
-        'manufacturerName': SAMPLE_MANUFACTURER,
-        'modelName': 'Thermostat',
-        'version': '1',
-        'friendlyName': 'Hallway',
-        'friendlyDescription': 'Thermostat in COOL mode and reachable',
-        'isReachable': True,
-        'actions': [
-            'setTargetTemperature',
-            'incrementTargetTemperature',
-            'decrementTargetTemperature',
-            'getTargetTemperature',
-            'getTemperatureReading',            
-        ],
-        'additionalApplianceDetails': {}
-    },
-    {
-        'applianceId': 'ThermostatEco-001',
-        'manufacturerName': SAMPLE_MANUFACTURER,
-        'modelName': 'Thermostat',
-        'version': '1',
-        'friendlyName': 'Kitchen',
-        'friendlyDescription': 'Thermostat in ECO mode and reachable',
-        'isReachable': True,
-        'actions': [
-            'setTargetTemperature',
-            'incrementTargetTemperature',
-            'decrementTargetTemperature',
-            'getTargetTemperature',
-            'getTemperatureReading',            
-        ],
+        'actions': list(_SWITCH_ACTIONS),
         'additionalApplianceDetails': {}
     },
+] + [
     {
-        'applianceId': 'ThermostatCustom-001',
+        'applianceId': appliance_id,
         'manufacturerName': SAMPLE_MANUFACTURER,
         'modelName': 'Thermostat',
         'version': '1',
-        'friendlyName': 'Laundry Room',
-        'friendlyDescription': 'Thermostat in CUSTOM mode and reachable',
+        'friendlyName': friendly_name,
+        'friendlyDescription': f'Thermostat in {mode} mode and reachable',
         'isReachable': True,
-        'actions': [
-            'setTargetTemperature',
-            'incrementTargetTemperature',
-            'decrementTargetTemperature',
-            'getTargetTemperature',
-            'getTemperatureReading',            
-        ],
+        'actions': list(_THERMOSTAT_ACTIONS),
         'additionalApplianceDetails': {}
-    },
-    {
-        'applianceId': 'ThermostatOff-001',
-        'manufacturerName': SAMPLE_MANUFACTURER,
-        'modelName': 'Thermostat',
-        'version': '1',
-        'friendlyName': 'Living Room',
-        'friendlyDescription': 'Thermostat in OFF mode and reachable',
-        'isReachable': True,
-        'actions': [
-            'setTargetTemperature',
-            'incrementTargetTemperature',
-            'decrementTargetTemperature',
-            'getTargetTemperature',
-            'getTemperatureReading',            
-        ],
-        'additionalApplianceDetails': {}
-    },
+    }
+    for appliance_id, friendly_name, mode in _SAMPLE_THERMOSTATS
+] + [
     {
         'applianceId': 'Lock-001',
         'manufacturerName': SAMPLE_MANUFACTURER,
@@ -199,29 +119,127 @@ SAMPLE_APPLIANCES = [
         'friendlyName': 'Door',
         'friendlyDescription': 'Lock that is functional and reachable',
         'isReachable': True,
-        'actions': [
-            'setLockState',
-            'getLockState',
-        ],
+        'actions': list(_LOCK_ACTIONS),
         'additionalApplianceDetails': {}
     },
 ]
 
+# this should be in sync with same list in validation.py
+VALID_CONTROL_ERROR_RESPONSE_NAMES = [
+    'ValueOutOfRangeError',
+    'TargetOfflineError',
+    'BridgeOfflineError',
+    'NoSuchTargetError',
+    'DriverInternalError',
+    'DependentServiceUnavailableError',
+    'TargetConnectivityUnstableError',
+    'TargetBridgeConnectivityUnstableError',
+    'TargetFirmwareOutdatedError',
+    'TargetBridgeFirmwareOutdatedError',
+    'TargetHardwareMalfunctionError',
+    'TargetBridgeHardwareMalfunctionError',
+    'UnableToGetValueError',
+    'UnableToSetValueError',
+    'UnwillingToSetValueError',
+    'RateLimitExceededError',
+    'NotSupportedInCurrentModeError',
+    'ExpiredAccessTokenError',
+    'InvalidAccessTokenError',
+    'UnsupportedTargetError',
+    'UnsupportedOperationError',
+    'UnsupportedTargetSettingError',
+    'UnexpectedInformationReceivedError'
+]
+
+# Sample error appliances, as (code, modelName, actions, friendlyName format, utterance) rows per error.
+# Errors without an entry get a single switch from _DEFAULT_ERROR_SPECS.
+_UNABLE_ERROR_INFO_CODES = ('DEVICE_AJAR','DEVICE_BUSY','DEVICE_JAMMED','DEVICE_OVERHEATED','HARDWARE_FAILURE','LOW_BATTERY','NOT_CALIBRATED')
+_CURRENT_DEVICE_MODES = ('HEAT','COOL','AUTO','AWAY','OTHER','COLOR')
+_DEFAULT_ERROR_SPECS = [(None,'Switch',_SWITCH_ACTIONS,'{}','turn on {}.')]
+_ERROR_SPECS = {
+    'ValueOutOfRangeError': [(None,'Thermostat',_TARGET_TEMPERATURE_ACTIONS,'{}','set {} to 80 degrees.')],
+    'UnableToGetValueError': [(code,'Lock',_LOCK_ACTIONS,'{} door','is {} locked?') for code in _UNABLE_ERROR_INFO_CODES],
+    'UnableToSetValueError': [(code,'Lock',_LOCK_ACTIONS,'{} door','lock {}.') for code in _UNABLE_ERROR_INFO_CODES],
+    'NotSupportedInCurrentModeError': [
+        (mode,'Light' if mode == 'COLOR' else 'Switch',_SWITCH_ACTIONS + ('incrementColorTemperature','decrementColorTemperature'),'{}','turn on {}.')
+        for mode in _CURRENT_DEVICE_MODES
+    ],
+}
+
+NAMESPACE_DISCOVERY = 'Alexa.ConnectedHome.Discovery'
+NAMESPACE_CONTROL = 'Alexa.ConnectedHome.Control'
+NAMESPACE_QUERY = 'Alexa.ConnectedHome.Query'
+
+_CONTROL_NAMESPACES = frozenset((NAMESPACE_CONTROL,NAMESPACE_QUERY))
+_UNABLE_ERROR_NAMES = frozenset(('UnableToGetValueError','UnableToSetValueError'))
+_TEMP_REQUEST_NAMES = frozenset(('SetTargetTemperatureRequest','IncrementTargetTemperatureRequest','DecrementTargetTemperatureRequest'))
+# thermostat modes that report a single target temperature
+_SINGLE_TARGET_MODES = frozenset(('HEAT','COOL','ECO','CUSTOM'))
+
+# confirmation names for the on/off, percentage and target temperature requests
+_CONFIRM_MAP = {
+    'TurnOnRequest': 'TurnOnConfirmation',
+    'TurnOffRequest': 'TurnOffConfirmation',
+    'SetTargetTemperatureRequest': 'SetTargetTemperatureConfirmation',
+    'IncrementTargetTemperatureRequest': 'IncrementTargetTemperatureConfirmation',
+    'DecrementTargetTemperatureRequest': 'DecrementTargetTemperatureConfirmation',
+    'SetPercentageRequest': 'SetPercentageConfirmation',
+    'IncrementPercentageRequest': 'IncrementPercentageConfirmation',
+    'DecrementPercentageRequest': 'DecrementPercentageConfirmation',
+}
+
+# payloads of the sample error responses that do not depend on the appliance. They are returned as is, not
+# copied, so every response shares them: nothing may modify a response after handleControl builds it.
+_FIRMWARE_OUTDATED_PAYLOAD = {
+    'minimumFirmwareVersion': '17',
+    'currentFirmwareVersion': '6',
+}
+_ERROR_PAYLOADS = {
+    'ValueOutOfRangeError': {
+        'minimumValue': MINIMUM_TEMPERATURE,
+        'maximumValue': MAXIMUM_TEMPERATURE,
+    },
+    'DependentServiceUnavailableError': {
+        'dependentServiceName': 'Customer Credentials Database',
+    },
+    'TargetFirmwareOutdatedError': _FIRMWARE_OUTDATED_PAYLOAD,
+    'TargetBridgeFirmwareOutdatedError': _FIRMWARE_OUTDATED_PAYLOAD,
+    'UnwillingToSetValueError': {
+        'errorInfo': {
+            'code': 'ThermostatIsOff',
+            'description': 'The requested operation is unsafe because it requires changing the mode.',
+        }
+    },
+    'RateLimitExceededError': {
+        'rateLimit': '10',
+        'timeUnit': 'HOUR',
+    },
+    'UnexpectedInformationReceivedError': {
+        'faultingParameter': 'value',
+    },
+}
+
 def lambda_handler(event,context):
     try:
         validateContext(context)
 
-        logger.info('Request Header:{}'.format(event['header']))
-        logger.info('Request Payload:{}'.format(event['payload']))
+        request_header = event['header']
+        request_namespace = request_header['namespace']
+
+        log_messages = logger.isEnabledFor(logging.INFO)
+        if log_messages:
+            logger.info('Request Header:%s',request_header)
+            logger.info('Request Payload:%s',event['payload'])
 
         response = {}
-        if event['header']['namespace'] == 'Alexa.ConnectedHome.Discovery':
+        if request_namespace == NAMESPACE_DISCOVERY:
             response = handleDiscovery(event,context)      
-        elif event['header']['namespace'] in ['Alexa.ConnectedHome.Control','Alexa.ConnectedHome.Query']:
+        elif request_namespace in _CONTROL_NAMESPACES:
             response = handleControl(event,context)
 
-        logger.info('Response Header:{}'.format(response['header']))
-        logger.info('Response Payload:{}'.format(response['payload']))
+        if log_messages:
+            logger.info('Response Header:%s',response['header'])
+            logger.info('Response Payload:%s',response['payload'])
 
         validateResponse(event,response)     
         
@@ -231,64 +249,39 @@ def lambda_handler(event,context):
         raise
         
 def handleDiscovery(event,context):
-    response_name = 'DiscoverAppliancesResponse'
-    header = generateResponseHeader(event,response_name)
-    payload = {
-       'discoveredAppliances': SAMPLE_APPLIANCES + generateSampleErrorAppliances()
+    # only the messageId differs between discovery responses, so the payload is shared
+    header = dict(_DISCOVERY_RESPONSE['header'])
+    header['messageId'] = event['header']['messageId']
+    response = {
+        'header': header,
+        'payload': _DISCOVERY_RESPONSE['payload'],
     }
-    response = generateResponse(header,payload)
     return response
 
 def handleControl(event,context):
     payload = {}
-    appliance_id = event['payload']['appliance']['applianceId']
-    message_id = event['header']['messageId']
-    request_name = event['header']['name']
+    request_header = event['header']
+    request_payload = event['payload']
+    appliance_id = request_payload['appliance']['applianceId']
+    message_id = request_header['messageId']
+    request_name = request_header['name']
 
     response_name = ''
 
-    previous_temperature = 21.0
-    minimum_temperature = 5.0
-    maximum_temperature = 30.0
+    thermostat_mode = _THERMOSTAT_MODES.get(appliance_id)
+    if thermostat_mode is not None:
+        return generateTemperatureResponse(event,PREVIOUS_TEMPERATURE,thermostat_mode,thermostat_mode,MINIMUM_TEMPERATURE,MAXIMUM_TEMPERATURE)
 
-    if appliance_id == 'ThermostatAuto-001':
-        previous_mode = 'AUTO'
-        target_mode = 'AUTO'
-        response = generateTemperatureResponse(event,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature)
+    if appliance_id == 'Dimmer-001':
+        return generateLightingResponse(event)
 
-    elif appliance_id == 'ThermostatHeat-001':
-        previous_mode = 'HEAT'
-        target_mode = 'HEAT'
-        response = generateTemperatureResponse(event,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature)
-    
-    elif appliance_id == 'ThermostatCool-001':
-        previous_mode = 'COOL'
-        target_mode = 'COOL'
-        response = generateTemperatureResponse(event,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature)
-
-    elif appliance_id == 'ThermostatEco-001':
-        previous_mode = 'ECO'
-        target_mode = 'ECO'
-        response = generateTemperatureResponse(event,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature)
-
-    elif appliance_id == 'ThermostatCustom-001':
-        previous_mode = 'CUSTOM'
-        target_mode = 'CUSTOM'
-        response = generateTemperatureResponse(event,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature)
-
-    elif appliance_id == 'ThermostatOff-001':
-        previous_mode = 'OFF'
-        target_mode = 'OFF'
-        response = generateTemperatureResponse(event,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature)
-
-    elif appliance_id == 'Dimmer-001':
-        response = generateLightingResponse(event)
-
-    elif appliance_id == 'Lock-001':
+    namespace = request_header['namespace']
+
+    if appliance_id == 'Lock-001':
         if request_name == 'SetLockStateRequest':
             response_name = 'SetLockStateConfirmation'
             payload = {
-                'lockState': event['payload']['lockState']
+                'lockState': request_payload['lockState']
             }
 
         elif request_name == 'GetLockStateRequest':
@@ -297,327 +290,92 @@ def handleControl(event,context):
                 'lockState': 'UNLOCKED',
                 'applianceResponseTimestamp': getUTCTimestamp()
             }
-        header = generateResponseHeader(event,response_name)
-        response = generateResponse(header,payload)
 
     elif isSampleErrorAppliance(appliance_id):
-        response_name = appliance_id.split("-")[0]
-        header = generateResponseHeader(event,response_name)
-        payload = {}
-        if response_name == 'ValueOutOfRangeError':
-            payload = {
-                'minimumValue': 5.0,
-                'maximumValue': 30.0,
-            }
-        elif response_name == 'DependentServiceUnavailableError':
-            payload = {
-                'dependentServiceName': 'Customer Credentials Database',
-            }
-        elif response_name == 'TargetFirmwareOutdatedError' or response_name == 'TargetBridgeFirmwareOutdatedError':
-            payload = {
-                'minimumFirmwareVersion': '17',
-                'currentFirmwareVersion': '6',
-            }
-        elif response_name in ['UnableToGetValueError','UnableToSetValueError']:
-            code = appliance_id.split("-")[1]
+        response_name, code = _ERROR_APPLIANCE_ERRORS[appliance_id]
+        if response_name in _UNABLE_ERROR_NAMES:
             if response_name == 'UnableToGetValueError':
-                header['namespace'] = 'Alexa.ConnectedHome.Query'
+                namespace = NAMESPACE_QUERY
             payload = {
                 'errorInfo': {
                     'code': code,
-                    'description': 'The requested operation cannot be completed because the device is ' + code,
+                    'description': f'The requested operation cannot be completed because the device is {code}',
                 }
             }
-            
-        elif response_name == 'UnwillingToSetValueError':
-            payload = {
-                'errorInfo': {
-                    'code': 'ThermostatIsOff',
-                    'description': 'The requested operation is unsafe because it requires changing the mode.',
-                }
-            }
-        elif response_name == 'RateLimitExceededError':
-            payload = {
-                'rateLimit': '10',
-                'timeUnit': 'HOUR',
-            }
         elif response_name == 'NotSupportedInCurrentModeError':
-            code = appliance_id.split("-")[1]
             payload = {
                 'currentDeviceMode': code,
             }
-        elif response_name == 'UnexpectedInformationReceivedError':
-            payload = {
-                'faultingParameter': 'value',
-            }
-
-        response = generateResponse(header,payload)
+        else:
+            payload = _ERROR_PAYLOADS.get(response_name,{})
 
     else:
+        response_name = _CONFIRM_MAP.get(request_name,'')
+        if request_name in _TEMP_REQUEST_NAMES:
+            target_temperature = calculateTargetTemperature(event,PREVIOUS_TEMPERATURE)
+            payload = buildTargetTemperaturePayload(target_temperature,PREVIOUS_TEMPERATURE,'AUTO','AUTO')
 
-        if request_name == 'TurnOnRequest': response_name = 'TurnOnConfirmation'
-        if request_name == 'TurnOffRequest': response_name = 'TurnOffConfirmation'
-        if request_name == 'SetTargetTemperatureRequest': 
-            response_name = 'SetTargetTemperatureConfirmation'
-            target_temperature = event['payload']['targetTemperature']['value']
-            payload = {
-                'targetTemperature': {
-                    'value': target_temperature
-                },
-                'temperatureMode': {
-                    'value': 'AUTO'
-                },
-                'previousState' : {
-                    'targetTemperature':{
-                        'value': 21.0
-                    },
-                    'temperatureMode':{
-                        'value': 'AUTO'
-                    }
-                }
-            }
-        if request_name == 'IncrementTargetTemperatureRequest':
-            response_name = 'IncrementTargetTemperatureConfirmation'
-            delta_temperature = event['payload']['deltaTemperature']['value']
-            payload = {
-                'previousState': {
-                    'temperatureMode': {
-                        'value': 'AUTO'
-                    },
-                    'targetTemperature': {
-                        'value': 21.0
-                    }
-                },
-                'targetTemperature': {
-                    'value': 21.0 + delta_temperature
-                },
-                'temperatureMode': {
-                    'value': 'AUTO'
-                }
-            }        
-        if request_name == 'DecrementTargetTemperatureRequest':
-            response_name = 'DecrementTargetTemperatureConfirmation'
-            delta_temperature = event['payload']['deltaTemperature']['value']
-            payload = {
-                'previousState': {
-                    'temperatureMode': {
-                        'value': 'AUTO'
-                    },
-                    'targetTemperature': {
-                        'value': 21.0
-                    }
-                },
-                'targetTemperature': {
-                    'value': 21.0 - delta_temperature
-                },
-                'temperatureMode': {
-                    'value': 'AUTO'
-                }
-            }        
-        if request_name == 'SetPercentageRequest': response_name = 'SetPercentageConfirmation'
-        if request_name == 'IncrementPercentageRequest': response_name = 'IncrementPercentageConfirmation'
-        if request_name == 'DecrementPercentageRequest': response_name = 'DecrementPercentageConfirmation'
-        
         if appliance_id == 'SwitchUnreachable-001':
             response_name = 'TargetOfflineError'
-    
-        header = generateResponseHeader(event,response_name)
-        response = generateResponse(header,payload)
 
+    # responses are built inline rather than through helper functions, as this runs on every request
+    response = {
+        'header': {
+            'namespace': namespace,
+            'name': response_name,
+            'payloadVersion': '2',
+            'messageId': message_id,
+        },
+        'payload': payload,
+    }
     return response
 
 # utility functions
-def generateSampleErrorAppliances():
-    # this should be in sync with same list in validation.py
-    VALID_CONTROL_ERROR_RESPONSE_NAMES = [
-        'ValueOutOfRangeError',
-        'TargetOfflineError',
-        'BridgeOfflineError',
-        'NoSuchTargetError',
-        'DriverInternalError',
-        'DependentServiceUnavailableError',
-        'TargetConnectivityUnstableError',
-        'TargetBridgeConnectivityUnstableError',
-        'TargetFirmwareOutdatedError',
-        'TargetBridgeFirmwareOutdatedError',
-        'TargetHardwareMalfunctionError',
-        'TargetBridgeHardwareMalfunctionError',
-        'UnableToGetValueError',
-        'UnableToSetValueError',
-        'UnwillingToSetValueError',
-        'RateLimitExceededError',
-        'NotSupportedInCurrentModeError',
-        'ExpiredAccessTokenError',
-        'InvalidAccessTokenError',
-        'UnsupportedTargetError',
-        'UnsupportedOperationError',
-        'UnsupportedTargetSettingError',
-        'UnexpectedInformationReceivedError'
-    ]
-    sample_error_appliances = []
-    
-    device_number = 1
-
-    for error in VALID_CONTROL_ERROR_RESPONSE_NAMES:
-        if error in ['UnableToGetValueError','UnableToSetValueError']:
-            VALID_UNABLE_ERROR_INFO_CODES = [
-                'DEVICE_AJAR',
-                'DEVICE_BUSY',
-                'DEVICE_JAMMED',
-                'DEVICE_OVERHEATED',
-                'HARDWARE_FAILURE',
-                'LOW_BATTERY',
-                'NOT_CALIBRATED'
-            ]
-            for code in VALID_UNABLE_ERROR_INFO_CODES:
-                friendly_name = generateErrorFriendlyName(device_number) + ' door'
-                if error == 'UnableToGetValueError':
-                    friendly_description = 'Utterance: Alexa, is ' + friendly_name + ' locked? Response: ' + error + ' code: ' + code    
-                else:
-                    friendly_description = 'Utterance: Alexa, lock ' + friendly_name + '. Response: ' + error + ' code: ' + code    
-
-                sample_error_appliance = {
-                    'applianceId': error + '-' + code + '-001',
-                    'manufacturerName': SAMPLE_MANUFACTURER,
-                    'modelName': 'Lock',
-                    'version': '1',
-                    'friendlyName': friendly_name,
-                    'friendlyDescription': friendly_description,
-                    'isReachable': True,
-                    'actions': [
-                        'setLockState',
-                        'getLockState',                        
-                    ],
-                    'additionalApplianceDetails': {}
-                }
-
-                sample_error_appliances.append(sample_error_appliance)
-                device_number = device_number + 1
-
-        elif error == 'NotSupportedInCurrentModeError':
-            VALID_CURRENT_DEVICE_MODES = [
-                'HEAT',
-                'COOL',
-                'AUTO',
-                'AWAY',
-                'OTHER',
-                'COLOR'
-            ]
-            for code in VALID_CURRENT_DEVICE_MODES:
-                friendly_name = generateErrorFriendlyName(device_number)
-                friendly_description = 'Utterance: Alexa, turn on ' + friendly_name + '. Response: ' + error + ' code: ' + code
-                if code == 'COLOR':
-                    model_name = 'Light'
-                else:
-                    model_name = 'Switch'
-
-                sample_error_appliance = {
-                    'applianceId': error + '-' + code + '-001',
-                    'manufacturerName': SAMPLE_MANUFACTURER,
-                    'modelName': model_name,
-                    'version': '1',
-                    'friendlyName': friendly_name,
-                    'friendlyDescription': friendly_description,
-                    'isReachable': True,
-                    'actions': [
-                        'turnOn',
-                        'turnOff',
-                        'incrementColorTemperature',
-                        'decrementColorTemperature',                        
-                    ],
-                    'additionalApplianceDetails': {}
-                }
-
-                sample_error_appliances.append(sample_error_appliance)
-                device_number = device_number + 1
-
-        else:
-            friendly_name = generateErrorFriendlyName(device_number)
-            friendly_description = 'Utterance: Alexa, turn on ' + friendly_name + '. Response: ' + error    
-
-            sample_error_appliance = {
-                'applianceId': error + '-001',
-                'manufacturerName': SAMPLE_MANUFACTURER,
-                'modelName': 'Switch',
-                'version': '1',
-                'friendlyName': friendly_name,
-                'friendlyDescription': friendly_description,
-                'isReachable': True,
-                'actions': [
-                    'turnOn',
-                    'turnOff',                        
-                ],
-                'additionalApplianceDetails': {}
-            }
-
-            if error == 'ValueOutOfRangeError':
-                sample_error_appliance['friendlyDescription'] = 'Utterance: Alexa, set ' + friendly_name + ' to 80 degrees. Response: ' + error
-                sample_error_appliance['modelName'] = 'Thermostat'
-                sample_error_appliance['actions'] = [
-                    'setTargetTemperature',
-                    'incrementTargetTemperature',
-                    'decrementTargetTemperature',
-                ]
-
-            sample_error_appliances.append(sample_error_appliance)
-            device_number = device_number + 1
+def generateSampleErrorApplianceSpecs():
+    # one (error, code, modelName, actions, friendlyName format, utterance) row per sample error appliance
+    return [(error,) + spec for error in VALID_CONTROL_ERROR_RESPONSE_NAMES for spec in _ERROR_SPECS.get(error,_DEFAULT_ERROR_SPECS)]
+
+def generateSampleErrorAppliances(specs):
+    return [generateSampleErrorAppliance(device_number,*spec) for device_number, spec in enumerate(specs,1)]
+
+def generateSampleErrorAppliance(device_number,error,code,model_name,actions,friendly_name_format,utterance):
+    friendly_name = friendly_name_format.format(generateErrorFriendlyName(device_number))
+    friendly_description = f'Utterance: Alexa, {utterance.format(friendly_name)} Response: {error}'
+    appliance_id = generateSampleErrorApplianceId(error,code)
+    if code is not None:
+        friendly_description = f'{friendly_description} code: {code}'
+
+    sample_error_appliance = {
+        'applianceId': appliance_id,
+        'manufacturerName': SAMPLE_MANUFACTURER,
+        'modelName': model_name,
+        'version': '1',
+        'friendlyName': friendly_name,
+        'friendlyDescription': friendly_description,
+        'isReachable': True,
+        'actions': list(actions),
+        'additionalApplianceDetails': {}
+    }
+    return sample_error_appliance
 
-    return sample_error_appliances
+def generateSampleErrorApplianceId(error,code):
+    # e.g. ('UnableToSetValueError','DEVICE_JAMMED') -> UnableToSetValueError-DEVICE_JAMMED-001
+    if code is None:
+        return f'{error}-001'
+    return f'{error}-{code}-001'
 
 def isSampleErrorAppliance(appliance_id):
-    sample_error_appliances = generateSampleErrorAppliances()
-    for sample_error_appliance in sample_error_appliances:
-        if sample_error_appliance['applianceId'] == appliance_id: return True
-    return False
-
-def generateResponseHeader(request,response_name):
-    header = {
-        'namespace': request['header']['namespace'],
-        'name': response_name,
-        'payloadVersion': '2',
-        'messageId': request['header']['messageId'],        
-    }
-    return header
-
-def generateResponse(header,payload):
-    response = {
-        'header': header,
-        'payload': payload,
-    }
-    return response
+    return appliance_id in _ERROR_APPLIANCE_ERRORS
 
 def generateTemperatureResponse(request,previous_temperature,previous_mode,target_mode,minimum_temperature,maximum_temperature):
     request_name = request['header']['name']
     message_id = request['header']['messageId']
     
     # valid request    
-    if request_name in ['SetTargetTemperatureRequest','IncrementTargetTemperatureRequest','DecrementTargetTemperatureRequest']:
-        if request_name == 'SetTargetTemperatureRequest': 
-            response_name = 'SetTargetTemperatureConfirmation'
-            target_temperature = request['payload']['targetTemperature']['value']
-        if request_name == 'IncrementTargetTemperatureRequest':
-            response_name = 'IncrementTargetTemperatureConfirmation'
-            target_temperature = previous_temperature + request['payload']['deltaTemperature']['value']
-        if request_name == 'DecrementTargetTemperatureRequest':
-            response_name = 'DecrementTargetTemperatureConfirmation'
-            target_temperature = previous_temperature - request['payload']['deltaTemperature']['value']
-
-        payload = {
-            'targetTemperature': {
-                'value': target_temperature
-            },
-            'temperatureMode': {
-                'value': target_mode
-            },
-            'previousState' : {
-                'targetTemperature':{
-                    'value': previous_temperature
-                },
-                'temperatureMode':{
-                    'value': previous_mode
-                }
-            }        
-        }
+    if request_name in _TEMP_REQUEST_NAMES:
+        response_name = _CONFIRM_MAP[request_name]
+        target_temperature = calculateTargetTemperature(request,previous_temperature)
+        payload = buildTargetTemperaturePayload(target_temperature,previous_temperature,previous_mode,target_mode)
     elif request_name == 'GetTemperatureReadingRequest':
         response_name = 'GetTemperatureReadingResponse'
         payload = {
@@ -636,11 +394,11 @@ def generateTemperatureResponse(request,previous_temperature,previous_mode,targe
             }
         }
 
-        if target_mode in ['HEAT','COOL','ECO','CUSTOM']:
+        if target_mode in _SINGLE_TARGET_MODES:
             payload['targetTemperature'] = {
                 'value': 21.00,
             }
-        elif target_mode in ['AUTO']:
+        elif target_mode == 'AUTO':
             payload['coolingTargetTemperature'] = {
                 'value': 23.00
             }
@@ -655,11 +413,18 @@ def generateTemperatureResponse(request,previous_temperature,previous_mode,targe
     else:
         response_name = 'UnexpectedInformationReceivedError'
         payload = {
-            'faultingParameter': 'request.name: ' + request_name
+            'faultingParameter': f'request.name: {request_name}'
         }
 
-    header = generateResponseHeader(request,response_name)
-    response = generateResponse(header,payload)
+    response = {
+        'header': {
+            'namespace': request['header']['namespace'],
+            'name': response_name,
+            'payloadVersion': '2',
+            'messageId': message_id,
+        },
+        'payload': payload,
+    }
     return response
 
 def generateLightingResponse(request):
@@ -685,12 +450,13 @@ def generateLightingResponse(request):
 
     elif request_name == 'SetColorRequest':
         response_name = 'SetColorConfirmation'
+        color = request['payload']['color']
         payload = {
             'achievedState': {
                 'color': {
-                    'hue': request['payload']['color']['hue'],
-                    'saturation': request['payload']['color']['saturation'],
-                    'brightness': request['payload']['color']['brightness'],
+                    'hue': color['hue'],
+                    'saturation': color['saturation'],
+                    'brightness': color['brightness'],
                 }
             }
         }
@@ -728,18 +494,75 @@ def generateLightingResponse(request):
     else:
         response_name = 'UnexpectedInformationReceivedError'
         payload = {
-            'faultingParameter': 'request.name: ' + request_name
+            'faultingParameter': f'request.name: {request_name}'
         }
 
-    header = generateResponseHeader(request,response_name)
-    response = generateResponse(header,payload)
+    response = {
+        'header': {
+            'namespace': request['header']['namespace'],
+            'name': response_name,
+            'payloadVersion': '2',
+            'messageId': message_id,
+        },
+        'payload': payload,
+    }
     return response
 
+def calculateTargetTemperature(request,previous_temperature):
+    request_name = request['header']['name']
+    if request_name == 'SetTargetTemperatureRequest':
+        return request['payload']['targetTemperature']['value']
+    delta_temperature = request['payload']['deltaTemperature']['value']
+    if request_name == 'IncrementTargetTemperatureRequest':
+        return previous_temperature + delta_temperature
+    return previous_temperature - delta_temperature
+
+def buildTargetTemperaturePayload(target_temperature,previous_temperature,previous_mode,target_mode):
+    payload = {
+        'targetTemperature': {
+            'value': target_temperature
+        },
+        'temperatureMode': {
+            'value': target_mode
+        },
+        'previousState' : {
+            'targetTemperature':{
+                'value': previous_temperature
+            },
+            'temperatureMode':{
+                'value': previous_mode
+            }
+        }
+    }
+    return payload
+
 def generateErrorFriendlyName(device_number):
-    return 'Device ' + str(device_number)
+    return f'Device {device_number}'
 
 
 """Utility functions."""
 
 def getUTCTimestamp(seconds=None):
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
\ No newline at end of file
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+# Everything that does not depend on the request is built here, while the module is loaded. Lambda runs
+# this during its init phase, so the work is done once per container instead of once per request.
+_ERROR_APPLIANCE_SPECS = generateSampleErrorApplianceSpecs()
+_ERROR_APPLIANCES = generateSampleErrorAppliances(_ERROR_APPLIANCE_SPECS)
+_ERROR_APPLIANCE_ERRORS = {generateSampleErrorApplianceId(error,code): (error,code) for error, code, *_ in _ERROR_APPLIANCE_SPECS}
+ALL_APPLIANCES = SAMPLE_APPLIANCES + _ERROR_APPLIANCES
+# Responses stay dicts rather than pre-serialized JSON: validateResponse inspects them, and the Lambda
+# runtime serializes whatever the handler returns, so returning bytes would not skip any work.
+# handleDiscovery copies the header to set the messageId but shares the payload, and with it the
+# appliance dicts, across requests; nothing may modify a discovery response after it is built.
+_DISCOVERY_RESPONSE = {
+    'header': {
+        'namespace': NAMESPACE_DISCOVERY,
+        'name': 'DiscoverAppliancesResponse',
+        'payloadVersion': '2',
+        'messageId': None,
+    },
+    'payload': {
+        'discoveredAppliances': ALL_APPLIANCES
+    },
+}
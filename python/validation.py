@@ -22,16 +22,21 @@ The validations are based on the current public Alexa Smart Home API reference:
 https://developer.amazon.com/public/solutions/alexa/alexa-skills-kit/docs/smart-home-skill-api-reference
 """
 
+import json
 import logging
 import re
-import sys
+from collections import namedtuple
 
 """Various constants used in validation."""
 
-VALID_DISCOVERY_REQUEST_NAMES = [
+VALID_CONTROL_AND_QUERY_NAMESPACES = frozenset([
+    'Alexa.ConnectedHome.Control',
+    'Alexa.ConnectedHome.Query'
+])
+VALID_DISCOVERY_REQUEST_NAMES = frozenset([
     'DiscoverAppliancesRequest'
-]
-VALID_CONTROL_REQUEST_NAMES = [
+])
+VALID_CONTROL_REQUEST_NAMES = frozenset([
     'TurnOnRequest',
     'TurnOffRequest',
     'SetTargetTemperatureRequest',
@@ -45,21 +50,21 @@ VALID_CONTROL_REQUEST_NAMES = [
     'SetColorTemperatureRequest',
     'IncrementColorTemperatureRequest',
     'DecrementColorTemperatureRequest'
-]
-VALID_QUERY_REQUEST_NAMES = [
+])
+VALID_QUERY_REQUEST_NAMES = frozenset([
     'GetLockStateRequest',
     'GetTemperatureReadingRequest',
     'GetTargetTemperatureRequest'
-]
-VALID_SYSTEM_REQUEST_NAMES = [
+])
+VALID_SYSTEM_REQUEST_NAMES = frozenset([
     'HealthCheckRequest'
-]
-VALID_REQUEST_NAMES = VALID_DISCOVERY_REQUEST_NAMES + VALID_QUERY_REQUEST_NAMES + VALID_CONTROL_REQUEST_NAMES + VALID_SYSTEM_REQUEST_NAMES
+])
+VALID_REQUEST_NAMES = VALID_DISCOVERY_REQUEST_NAMES | VALID_QUERY_REQUEST_NAMES | VALID_CONTROL_REQUEST_NAMES | VALID_SYSTEM_REQUEST_NAMES
 
-VALID_DISCOVERY_RESPONSE_NAMES = [
+VALID_DISCOVERY_RESPONSE_NAMES = frozenset([
     'DiscoverAppliancesResponse'
-]
-VALID_CONTROL_RESPONSE_NAMES = [
+])
+VALID_CONTROL_RESPONSE_NAMES = frozenset([
     'TurnOnConfirmation',
     'TurnOffConfirmation',
     'SetTargetTemperatureConfirmation',
@@ -73,8 +78,8 @@ VALID_CONTROL_RESPONSE_NAMES = [
     'SetColorTemperatureConfirmation',
     'IncrementColorTemperatureConfirmation',
     'DecrementColorTemperatureConfirmation'
-]
-VALID_CONTROL_ERROR_RESPONSE_NAMES = [
+])
+VALID_CONTROL_ERROR_RESPONSE_NAMES = frozenset([
     'ValueOutOfRangeError',
     'TargetOfflineError',
     'BridgeOfflineError',
@@ -98,18 +103,20 @@ VALID_CONTROL_ERROR_RESPONSE_NAMES = [
     'UnsupportedOperationError',
     'UnsupportedTargetSettingError',
     'UnexpectedInformationReceivedError'
-]
-VALID_QUERY_RESPONSE_NAMES = [
+])
+VALID_QUERY_RESPONSE_NAMES = frozenset([
     'GetLockStateResponse',
     'GetTemperatureReadingResponse',
     'GetTargetTemperatureResponse'
-]
-VALID_SYSTEM_RESPONSE_NAMES = [
+])
+VALID_SYSTEM_RESPONSE_NAMES = frozenset([
     'HealthCheckResponse'
-]
-VALID_RESPONSE_NAMES = VALID_DISCOVERY_RESPONSE_NAMES + VALID_CONTROL_RESPONSE_NAMES + VALID_CONTROL_ERROR_RESPONSE_NAMES + VALID_QUERY_RESPONSE_NAMES + VALID_SYSTEM_RESPONSE_NAMES
+])
+VALID_RESPONSE_NAMES = VALID_DISCOVERY_RESPONSE_NAMES | VALID_CONTROL_RESPONSE_NAMES | VALID_CONTROL_ERROR_RESPONSE_NAMES | VALID_QUERY_RESPONSE_NAMES | VALID_SYSTEM_RESPONSE_NAMES
+VALID_CONTROL_RESPONSE_OR_ERROR_NAMES = VALID_CONTROL_RESPONSE_NAMES | VALID_CONTROL_ERROR_RESPONSE_NAMES
+VALID_QUERY_RESPONSE_OR_ERROR_NAMES = VALID_QUERY_RESPONSE_NAMES | VALID_CONTROL_ERROR_RESPONSE_NAMES
 
-VALID_NON_EMPTY_PAYLOAD_RESPONSE_NAMES = [
+VALID_NON_EMPTY_PAYLOAD_RESPONSE_NAMES = frozenset([
     'SetColorConfirmation',
     'SetColorTemperatureConfirmation',
     'IncrementColorTemperatureConfirmation',
@@ -131,8 +138,8 @@ VALID_NON_EMPTY_PAYLOAD_RESPONSE_NAMES = [
     'RateLimitExceededError',
     'NotSupportedInCurrentModeError',
     'UnexpectedInformationReceivedError'
-]
-VALID_ACTIONS = [
+])
+VALID_ACTIONS = frozenset([
     'decrementColorTemperature',
     'decrementPercentage',
     'decrementTargetTemperature',
@@ -149,31 +156,31 @@ VALID_ACTIONS = [
     'setTargetTemperature',
     'turnOff',
     'turnOn'
-]
-VALID_TEMPERATURE_MODES = [
+])
+VALID_TEMPERATURE_MODES = frozenset([
     'HEAT',
     'COOL',
     'AUTO',
     'ECO',
     'OFF',
     'CUSTOM'
-]
-VALID_CURRENT_DEVICE_MODES = [
+])
+VALID_CURRENT_DEVICE_MODES = frozenset([
     'HEAT',
     'COOL',
     'AUTO',
     'AWAY',
     'OTHER',
     'COLOR'
-]
-VALID_LOCK_STATES = [
+])
+VALID_LOCK_STATES = frozenset([
     'LOCKED',
     'UNLOCKED'
-]
-VALID_UNWILLING_ERROR_INFO_CODES = [
+])
+VALID_UNWILLING_ERROR_INFO_CODES = frozenset([
     'ThermostatIsOff'
-]
-VALID_UNABLE_ERROR_INFO_CODES = [
+])
+VALID_UNABLE_ERROR_INFO_CODES = frozenset([
     'DEVICE_AJAR',
     'DEVICE_BUSY',
     'DEVICE_JAMMED',
@@ -181,23 +188,23 @@ VALID_UNABLE_ERROR_INFO_CODES = [
     'HARDWARE_FAILURE',
     'LOW_BATTERY',
     'NOT_CALIBRATED'
-]
-VALID_TIME_UNITS = [
+])
+VALID_TIME_UNITS = frozenset([
     'MINUTE',
     'HOUR',
     'DAY'
-]
-REQUIRED_RESPONSE_KEYS = [
+])
+REQUIRED_RESPONSE_KEYS = (
     'header',
     'payload'
-]
-REQUIRED_HEADER_KEYS = [
+)
+REQUIRED_HEADER_KEYS = (
     'namespace',
     'name',
     'payloadVersion',
     'messageId'
-]
-REQUIRED_DISCOVERED_APPLIANCE_KEYS = [
+)
+REQUIRED_DISCOVERED_APPLIANCE_KEYS = (
     'applianceId',
     'manufacturerName',
     'modelName',
@@ -207,8 +214,81 @@ REQUIRED_DISCOVERED_APPLIANCE_KEYS = [
     'isReachable',
     'actions',
     'additionalApplianceDetails'
-]
+)
+REQUIRED_HEALTH_CHECK_KEYS = (
+    'description',
+    'isHealthy'
+)
+REQUIRED_TARGET_TEMPERATURE_CONFIRMATION_KEYS = (
+    'targetTemperature',
+    'temperatureMode',
+    'previousState'
+)
+REQUIRED_PREVIOUS_STATE_KEYS = (
+    'targetTemperature',
+    'temperatureMode'
+)
+REQUIRED_ERROR_INFO_KEYS = (
+    'code',
+    'description'
+)
+REQUIRED_RATE_LIMIT_KEYS = (
+    'rateLimit',
+    'timeUnit'
+)
 MAX_DISCOVERED_APPLIANCES = 300
+MAX_ADDITIONAL_APPLIANCE_DETAILS_SIZE = 5000
+# one shared encoder: json.dumps with non-default arguments builds a new JSONEncoder on every call
+COMPACT_JSON_ENCODER = json.JSONEncoder(separators=(',',':'))
+
+# Header rules for the requests of one namespace. error_names are error responses accepted in place of the
+# expected response, which is the request name with 'Request' replaced by response_suffix.
+_ResponseHeaderRule = namedtuple('_ResponseHeaderRule',['title','namespaces','namespace_message','response_names','error_names','response_suffix'])
+_DISCOVERY_HEADER_RULE = _ResponseHeaderRule(
+    title='Discovery Response',
+    namespaces=frozenset(['Alexa.ConnectedHome.Discovery']),
+    namespace_message='header.namespace must be Alexa.ConnectedHome.Discovery',
+    response_names=VALID_DISCOVERY_RESPONSE_NAMES,
+    error_names=frozenset(),
+    response_suffix='Response'
+)
+_CONTROL_HEADER_RULE = _ResponseHeaderRule(
+    title='Control Response',
+    namespaces=VALID_CONTROL_AND_QUERY_NAMESPACES,
+    namespace_message='header.namespace must be Alexa.ConnectedHome.Query or Alexa.ConnectedHome.Control',
+    response_names=VALID_CONTROL_RESPONSE_OR_ERROR_NAMES,
+    error_names=VALID_CONTROL_ERROR_RESPONSE_NAMES,
+    response_suffix='Confirmation'
+)
+_QUERY_HEADER_RULE = _ResponseHeaderRule(
+    title='Query Response',
+    namespaces=VALID_CONTROL_AND_QUERY_NAMESPACES,
+    namespace_message='header.namespace must be Alexa.ConnectedHome.Query or Alexa.ConnectedHome.Control',
+    response_names=VALID_QUERY_RESPONSE_OR_ERROR_NAMES,
+    error_names=VALID_CONTROL_ERROR_RESPONSE_NAMES,
+    response_suffix='Response'
+)
+_SYSTEM_HEADER_RULE = _ResponseHeaderRule(
+    title='System Response',
+    namespaces=frozenset(['Alexa.ConnectedHome.System']),
+    namespace_message='header.namespace must be Alexa.ConnectedHome.System',
+    response_names=VALID_SYSTEM_RESPONSE_NAMES,
+    error_names=frozenset(),
+    response_suffix='Response'
+)
+_RESPONSE_HEADER_RULES = {
+    **{request_name: _DISCOVERY_HEADER_RULE for request_name in VALID_DISCOVERY_REQUEST_NAMES},
+    **{request_name: _CONTROL_HEADER_RULE for request_name in VALID_CONTROL_REQUEST_NAMES},
+    **{request_name: _QUERY_HEADER_RULE for request_name in VALID_QUERY_REQUEST_NAMES},
+    **{request_name: _SYSTEM_HEADER_RULE for request_name in VALID_SYSTEM_REQUEST_NAMES},
+}
+_EXPECTED_RESPONSE_NAMES = {request_name: request_name.replace('Request',rule.response_suffix) for request_name, rule in _RESPONSE_HEADER_RULES.items()}
+
+# Character-set patterns for fullmatch(), which unlike match() with $ also rejects a trailing newline.
+ALPHANUMERIC_AND_SPACES_PATTERN = re.compile('[a-zA-Z0-9äüöÄÜÖß ]*')
+ALPHANUMERIC_PATTERN = re.compile('[a-zA-Z0-9äüöÄÜÖß]*')
+APPLIANCE_ID_PATTERN = re.compile(r'[a-zA-Z0-9_\-=#;:?@&]*')
+MESSAGE_ID_PATTERN = re.compile(r'[a-zA-Z0-9\-]*')
 
 
 def validateContext(context):
@@ -224,7 +304,7 @@ def validateContext(context):
     by the locks portion of the Smart Home Skill API.
     """
 
-    if context.get_remaining_time_in_millis() > 7000: raise_value_error(generate_error_message('Lambda','timeout must be 7 seconds or less (if your skill handles locks, change timeout validation to 60 seconds or less)',context))
+    if context.get_remaining_time_in_millis() > 7000: _fail('Lambda','timeout must be 7 seconds or less (if your skill handles locks, change timeout validation to 60 seconds or less)',context)
 
 def validateResponse(request,response):
     """Validate the response to a request.
@@ -235,32 +315,24 @@ def validateResponse(request,response):
     """
 
     # Validate request
-    if request is None: raise_value_error(generate_error_message('Request','request is missing',request))
-    if not bool(request): raise_value_error(generate_error_message('Request','request must not be empty',request))
-    if not isinstance(request,dict): raise_value_error(generate_error_message('Request','request must be a dict',request))
-    try:
-        request_namespace = request['header']['namespace']
-    except:
-        raise_value_error(generate_error_message('Request','request is invalid',request))
+    if request is None: _fail('Request','request is missing',request)
+    if not bool(request): _fail('Request','request must not be empty',request)
+    if not isinstance(request,dict): _fail('Request','request must be a dict',request)
+    request_header = request.get('header')
+    if not isinstance(request_header,dict) or 'namespace' not in request_header: _fail('Request','request is invalid',request)
+    request_namespace = request_header['namespace']
 
     # Validate response
-    if response is None: raise_value_error(generate_error_message('Response','response is missing',response))
-    if not bool(response): raise_value_error(generate_error_message('Response','response must not be empty',response))
-    if not isinstance(response,dict): raise_value_error(generate_error_message('Response','response must be a dict',response))
+    if response is None: _fail('Response','response is missing',response)
+    if not bool(response): _fail('Response','response must not be empty',response)
+    if not isinstance(response,dict): _fail('Response','response must be a dict',response)
 
     for required_key in REQUIRED_RESPONSE_KEYS:
-        if required_key not in response: raise_value_error(generate_error_message('Response',format(required_key) + ' is missing',response))
-
-    if request_namespace == 'Alexa.ConnectedHome.Discovery':
-        validateDiscoveryResponse(request,response)
-    elif request_namespace == 'Alexa.ConnectedHome.Control':
-        validateControlResponse(request,response)
-    elif request_namespace == 'Alexa.ConnectedHome.Query':
-        validateQueryResponse(request,response)
-    elif request_namespace == 'Alexa.ConnectedHome.System':
-        validateSystemResponse(request,response)
-    else:
-        raise_value_error(generate_error_message('Request','request.header.namespace is invalid',request))
+        if required_key not in response: _fail('Response',f'{required_key} is missing',response)
+
+    # Validate the rest of the response according to the request namespace
+    if not is_one_of(request_namespace,_RESPONSE_VALIDATORS): _fail('Request','request.header.namespace is invalid',request)
+    _RESPONSE_VALIDATORS[request_namespace](request,response)
 
 def validateSystemResponse(request,response):
     """Validate the response to a Health Check request.
@@ -270,21 +342,18 @@ def validateSystemResponse(request,response):
     """
 
     # Validate header
-    validateResponseHeader(request,response)
-    response_name = response['header']['name']
+    response_name = validateResponseHeader(request,response)
 
     # Validate response payload
-    try:
-        payload = response['payload']
-    except:
-        raise_value_error(generate_error_message(response_name,'payload is missing',response))
+    if 'payload' not in response: _fail(response_name,'payload is missing',response)
+    payload = response['payload']
 
-    if payload is None: raise_value_error(generate_error_message(response_name,'payload is missing',payload))
+    if payload is None: _fail(response_name,'payload is missing',payload)
 
-    for required_key in ['description','isHealthy']:
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if is_empty_string(payload['description']): raise_value_error(generate_error_message(response_name,'payload.description must not be empty',payload))
-        if not isinstance(payload['isHealthy'],bool): raise_value_error(generate_error_message(response_name,'payload.isHealthy must be a boolean',payload))
+    for required_key in REQUIRED_HEALTH_CHECK_KEYS:
+        if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    if is_empty_string(payload['description']): _fail(response_name,'payload.description must not be empty',payload)
+    if not isinstance(payload['isHealthy'],bool): _fail(response_name,'payload.isHealthy must be a boolean',payload)
 
 def validateDiscoveryResponse(request,response):
     """Validate the response to a DiscoverApplianceRequest request.
@@ -294,51 +363,64 @@ def validateDiscoveryResponse(request,response):
     """
 
     # Validate header
-    validateResponseHeader(request,response)
-    response_name = response['header']['name']
+    response_name = validateResponseHeader(request,response)
 
     # Validate response payload
-    try:
-        payload = response['payload']
-    except:
-        raise_value_error(generate_error_message(response_name,'payload is missing',response))
+    if 'payload' not in response: _fail(response_name,'payload is missing',response)
+    payload = response['payload']
 
-    if payload is None: raise_value_error(generate_error_message(response_name,'payload is missing',payload))
-    if not isinstance(payload,dict): raise_value_error(generate_error_message(response_name,'payload must be a dict',payload))
+    if payload is None: _fail(response_name,'payload is missing',payload)
+    if not isinstance(payload,dict): _fail(response_name,'payload must be a dict',payload)
 
-    if 'discoveredAppliances' not in payload: raise_value_error(generate_error_message(response_name,'payload.discoveredAppliances is missing',payload))
-    if not isinstance(payload['discoveredAppliances'],list): raise_value_error(generate_error_message(response_name,'payload.discoveredAppliances must be a list',payload))
-    if len(payload['discoveredAppliances']) > MAX_DISCOVERED_APPLIANCES: raise_value_error(generate_error_message(response_name,'payload.discoveredAppliances must not contain more than 300 appliances',payload))
+    if 'discoveredAppliances' not in payload: _fail(response_name,'payload.discoveredAppliances is missing',payload)
+    if not isinstance(payload['discoveredAppliances'],list): _fail(response_name,'payload.discoveredAppliances must be a list',payload)
+    if len(payload['discoveredAppliances']) > MAX_DISCOVERED_APPLIANCES: _fail(response_name,'payload.discoveredAppliances must not contain more than 300 appliances',payload)
 
     # Validate each discovered appliance
     for discoveredAppliance in payload['discoveredAppliances']:
 
         for required_key in REQUIRED_DISCOVERED_APPLIANCE_KEYS:
-            if required_key not in discoveredAppliance: raise_value_error(generate_error_message(response_name,format(required_key) + ' is missing',discoveredAppliance))
-
-        if is_empty_string(discoveredAppliance['applianceId']): raise_value_error(generate_error_message(response_name,'applianceId must not be empty',discoveredAppliance))
-        if len(discoveredAppliance['applianceId']) > 256: raise_value_error(generate_error_message(response_name,'applianceId must not exceed 256 characters',discoveredAppliance))
-        if not re.match('^[a-zA-Z0-9_\-=#;:?@&]*$',discoveredAppliance['applianceId']): raise_value_error(generate_error_message(response_name,'applianceId must be alphanumeric or include these special characters: _-=#;:?@&',discoveredAppliance))
-        if is_empty_string(discoveredAppliance['manufacturerName']): raise_value_error(generate_error_message(response_name,'manufacturerName must not be empty',discoveredAppliance))
-        if len(discoveredAppliance['manufacturerName']) > 128: raise_value_error(generate_error_message(response_name,'manufacturerName must not exceed 128 characters',discoveredAppliance))
-        if is_empty_string(discoveredAppliance['modelName']): raise_value_error(generate_error_message(response_name,'modelName must not be empty',discoveredAppliance))
-        if len(discoveredAppliance['modelName']) > 128: raise_value_error(generate_error_message(response_name,'modelName must not exceed 128 characters',discoveredAppliance))
-        if is_empty_string(discoveredAppliance['version']): raise_value_error(generate_error_message(response_name,'version must not be empty',discoveredAppliance))
-        if len(discoveredAppliance['version']) > 128: raise_value_error(generate_error_message(response_name,'version must not exceed 128 characters',discoveredAppliance))
-        if is_empty_string(discoveredAppliance['friendlyName']): raise_value_error(generate_error_message(response_name,'friendlyName must not be empty',discoveredAppliance))
-        if len(discoveredAppliance['friendlyName']) > 128: raise_value_error(generate_error_message(response_name,'friendlyName must not exceed 128 characters',discoveredAppliance))
-        if not is_alphanumeric_and_spaces(discoveredAppliance['friendlyName']): raise_value_error(generate_error_message(response_name,'friendlyName must be specified in alphanumeric characters and spaces',discoveredAppliance))
-        if is_empty_string(discoveredAppliance['friendlyDescription']): raise_value_error(generate_error_message(response_name,'friendlyDescription must not be empty',discoveredAppliance))
-        if len(discoveredAppliance['friendlyDescription']) > 128: raise_value_error(generate_error_message(response_name,'friendlyDescription must not exceed 128 characters',discoveredAppliance))
-        if not isinstance(discoveredAppliance['isReachable'],bool): raise_value_error(generate_error_message(response_name,'isReachable must be a boolean',discoveredAppliance))
-        if not isinstance(discoveredAppliance['actions'],list): raise_value_error(generate_error_message(response_name,'actions must be a list',discoveredAppliance))
-        if len(discoveredAppliance['actions']) == 0: raise_value_error(generate_error_message(response_name,'actions must not be empty',discoveredAppliance))
-
-        for action in discoveredAppliance['actions']:
-            if action not in VALID_ACTIONS: raise_value_error(generate_error_message(response_name,format(action) + ' is an invalid action',discoveredAppliance))
-
-        if discoveredAppliance['additionalApplianceDetails'] is not None:
-            if sys.getsizeof(discoveredAppliance['additionalApplianceDetails']) > 5000: raise_value_error(generate_error_message(response_name,'additionalApplianceDetails must not exceed 5000 bytes',discoveredAppliance))
+            if required_key not in discoveredAppliance: _fail(response_name,f'{required_key} is missing',discoveredAppliance)
+
+        appliance_id = discoveredAppliance['applianceId']
+        manufacturer_name = discoveredAppliance['manufacturerName']
+        model_name = discoveredAppliance['modelName']
+        version = discoveredAppliance['version']
+        friendly_name = discoveredAppliance['friendlyName']
+        friendly_description = discoveredAppliance['friendlyDescription']
+
+        if is_empty_string(appliance_id): _fail(response_name,'applianceId must not be empty',discoveredAppliance)
+        if len(appliance_id) > 256: _fail(response_name,'applianceId must not exceed 256 characters',discoveredAppliance)
+        if not is_appliance_id(appliance_id): _fail(response_name,'applianceId must be alphanumeric or include these special characters: _-=#;:?@&',discoveredAppliance)
+        if is_empty_string(manufacturer_name): _fail(response_name,'manufacturerName must not be empty',discoveredAppliance)
+        if len(manufacturer_name) > 128: _fail(response_name,'manufacturerName must not exceed 128 characters',discoveredAppliance)
+        if is_empty_string(model_name): _fail(response_name,'modelName must not be empty',discoveredAppliance)
+        if len(model_name) > 128: _fail(response_name,'modelName must not exceed 128 characters',discoveredAppliance)
+        if is_empty_string(version): _fail(response_name,'version must not be empty',discoveredAppliance)
+        if len(version) > 128: _fail(response_name,'version must not exceed 128 characters',discoveredAppliance)
+        if is_empty_string(friendly_name): _fail(response_name,'friendlyName must not be empty',discoveredAppliance)
+        if len(friendly_name) > 128: _fail(response_name,'friendlyName must not exceed 128 characters',discoveredAppliance)
+        if not is_alphanumeric_and_spaces(friendly_name): _fail(response_name,'friendlyName must be specified in alphanumeric characters and spaces',discoveredAppliance)
+        if is_empty_string(friendly_description): _fail(response_name,'friendlyDescription must not be empty',discoveredAppliance)
+        if len(friendly_description) > 128: _fail(response_name,'friendlyDescription must not exceed 128 characters',discoveredAppliance)
+
+        if not isinstance(discoveredAppliance['isReachable'],bool): _fail(response_name,'isReachable must be a boolean',discoveredAppliance)
+
+        actions = discoveredAppliance['actions']
+        if not isinstance(actions,list): _fail(response_name,'actions must be a list',discoveredAppliance)
+        if len(actions) == 0: _fail(response_name,'actions must not be empty',discoveredAppliance)
+
+        for action in actions:
+            if not is_one_of(action,VALID_ACTIONS): _fail(response_name,f'{action} is an invalid action',discoveredAppliance)
+
+        additional_appliance_details = discoveredAppliance['additionalApplianceDetails']
+        if additional_appliance_details is not None:
+            try:
+                additional_appliance_details_size = json_size(additional_appliance_details)
+            except (TypeError,ValueError):
+                _fail(response_name,'additionalApplianceDetails must be JSON serializable',discoveredAppliance)
+            else:
+                if additional_appliance_details_size > MAX_ADDITIONAL_APPLIANCE_DETAILS_SIZE: _fail(response_name,'additionalApplianceDetails must not exceed 5000 bytes',discoveredAppliance)
 
 def validateControlResponse(request,response):
     """Validate the response to a Control request.
@@ -348,117 +430,24 @@ def validateControlResponse(request,response):
     """
 
     # Validate header
-    validateResponseHeader(request,response)
-    request_name = request['header']['name']
-    response_name = response['header']['name']
+    response_name = validateResponseHeader(request,response)
 
     # Validate response payload
-    try:
-        payload = response['payload']
-    except:
-        raise_value_error(generate_error_message(response_name,'payload is missing',response))
+    if 'payload' not in response: _fail(response_name,'payload is missing',response)
+    payload = response['payload']
 
-    if payload is None: raise_value_error(generate_error_message(response_name,'payload is missing',payload))
-    if not isinstance(payload,dict): raise_value_error(generate_error_message(response_name,'payload must be a dict',payload))
+    if payload is None: _fail(response_name,'payload is missing',payload)
+    if not isinstance(payload,dict): _fail(response_name,'payload must be a dict',payload)
 
     # Validate non-empty control response payload
     if response_name not in VALID_NON_EMPTY_PAYLOAD_RESPONSE_NAMES:
-        if bool(payload): raise_value_error(generate_error_message(response_name,'payload must be empty',payload))
+        if bool(payload): _fail(response_name,'payload must be empty',payload)
     else:
-        if not bool(payload): raise_value_error(generate_error_message(response_name,'payload must not be empty',payload))
-
-    # Validate color and color temperature control response payload
-    if response_name in ['SetColorConfirmation','SetColorTemperatureConfirmation','IncrementColorTemperatureConfirmation','DecrementColorTemperatureConfirmation']:
-        # Validate payload
-        if 'achievedState' not in payload: raise_value_error(generate_error_message(response_name,'payload.achievedState is missing',payload))
-
-        if response_name == 'SetColorConfirmation':
-            if 'color' not in payload['achievedState']: raise_value_error(generate_error_message(response_name,'payload.achievedState.color is missing',payload))
-            for required_key in ['hue','saturation','brightness']:
-                if required_key not in payload['achievedState']['color']: raise_value_error(generate_error_message(response_name,'payload.achievedState.color.' + format(required_key) + ' is missing',payload))
-                if not is_number(payload['achievedState']['color'][required_key]): raise_value_error(generate_error_message(response_name,'payload.achievedState.color.' + format(required_key) + ' must be a number',payload))
-            if payload['achievedState']['color']['hue'] < 0 or payload['achievedState']['color']['hue'] > 360: raise_value_error(generate_error_message(response_name,'payload.achievedState.color.hue must be between 0.00 and 360.00 inclusive',payload))
-            if payload['achievedState']['color']['saturation'] < 0 or payload['achievedState']['color']['saturation'] > 1: raise_value_error(generate_error_message(response_name,'payload.achievedState.color.saturation must be between 0.0000 and 1.0000 inclusive',payload))
-            if payload['achievedState']['color']['brightness'] < 0 or payload['achievedState']['color']['brightness'] > 1: raise_value_error(generate_error_message(response_name,'payload.achievedState.color.brightness must be between 0.0000 and 1.0000 inclusive',payload))
-
-        if response_name in ['SetColorTemperatureConfirmation','IncrementColorTemperatureConfirmation','DecrementColorTemperatureConfirmation']:
-            if 'colorTemperature' not in payload['achievedState']: raise_value_error(generate_error_message(response_name,'payload.achievedState.colorTemperature is missing',payload))
-            if 'value' not in payload['achievedState']['colorTemperature']: raise_value_error(generate_error_message(response_name,'payload.achievedState.colorTemperature.value is missing',payload))
-            if not isinstance(payload['achievedState']['colorTemperature']['value'], int): raise_value_error(generate_error_message(response_name,'payload.achievedState.colorTemperature.value must be an integer',payload))
-            if payload['achievedState']['colorTemperature']['value'] < 1000 or payload['achievedState']['colorTemperature']['value'] > 10000: raise_value_error(generate_error_message(response_name,'payload.achievedState.colorTemperature.value must be between 1000 and 10000 inclusive',payload))
-
-    # Validate thermostat control response payload
-    if response_name in ['SetTargetTemperatureConfirmation','IncrementTargetTemperatureConfirmation','DecrementTargetTemperatureConfirmation']:
-        # Validate payload
-        for required_key in ['targetTemperature','temperatureMode','previousState']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if 'value' not in payload['targetTemperature']: raise_value_error(generate_error_message(response_name,'payload.targetTemperature.value is missing',payload))
-        if not is_number(payload['targetTemperature']['value']): raise_value_error(generate_error_message(response_name,'payload.targetTemperature.value must be a number',payload))
-        if 'value' not in payload['temperatureMode']: raise_value_error(generate_error_message(response_name,'payload.temperatureMode.value is missing',payload))
-        if payload['temperatureMode']['value'] not in VALID_TEMPERATURE_MODES: raise_value_error(generate_error_message(response_name,'payload.temperatureMode.value is invalid',payload))
-
-        # Validate payload.previousState
-        for required_key in ['targetTemperature','temperatureMode']:
-            if required_key not in payload['previousState']: raise_value_error(generate_error_message(response_name,'payload.previousState.' + format(required_key) + ' is missing',payload))
-        if 'value' not in payload['previousState']['targetTemperature']: raise_value_error(generate_error_message(response_name,'payload.previousState.targetTemperature.value is missing',payload))
-        if not is_number(payload['previousState']['targetTemperature']['value']): raise_value_error(generate_error_message(response_name,'payload.previousState.targetTemperature.value must be a number',payload))
-        if 'value' not in payload['previousState']['temperatureMode']: raise_value_error(generate_error_message(response_name,'payload.previousState.temperatureMode.value is missing',payload))
-        if payload['previousState']['temperatureMode']['value'] not in VALID_TEMPERATURE_MODES: raise_value_error(generate_error_message(response_name,'payload.previousState.temperatureMode.value is invalid',payload))
-
-    # Validate lock control response payload
-    if response_name in ['SetLockStateResponse']:
-        for required_key in ['lockState']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if payload['lockState'] not in VALID_LOCK_STATES: raise_value_error(generate_error_message(response_name,'payload.lockState is invalid',payload))
-
-    # Validate control error response payload
-    if response_name == 'ValueOutOfRangeError':
-        for required_key in ['minimumValue','maximumValue']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-            if not is_number(payload[required_key]): raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' must be a number',payload))
-
-    if response_name == 'DependentServiceUnavailableError':
-        required_key = 'dependentServiceName'
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if not is_alphanumeric_and_spaces(payload[required_key]): raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' must be specified in alphanumeric characters and spaces',payload))
-
-    if response_name in ['TargetFirmwareOutdatedError','TargetBridgeFirmwareOutdatedError']:
-        for required_key in ['minimumFirmwareVersion','currentFirmwareVersion']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-            if is_empty_string(payload[required_key]): raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' must not be empty',payload))
-            if not is_alphanumeric(payload[required_key]): raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' must be specified in alphanumeric characters',payload))
-
-    if response_name == 'UnableToSetValueError':
-        required_key = 'errorInfo'
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        for required_key in ['code','description']:
-            if required_key not in payload['errorInfo']: raise_value_error(generate_error_message(response_name,'payload.errorInfo' + format(required_key) + ' is missing',payload))
-        if payload['errorInfo']['code'] not in VALID_UNABLE_ERROR_INFO_CODES: raise_value_error(generate_error_message(response_name,'payload.errorInfo.code is invalid',payload))
-
-    if response_name == 'UnableToGetValueError': validateQueryResponse(request,response) # this is a really ugly hack
-
-    if response_name == 'UnwillingToSetValueError':
-        required_key = 'errorInfo'
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        for required_key in ['code','description']:
-            if required_key not in payload['errorInfo']: raise_value_error(generate_error_message(response_name,'payload.errorInfo' + format(required_key) + ' is missing',payload))
-        if payload['errorInfo']['code'] not in VALID_UNWILLING_ERROR_INFO_CODES: raise_value_error(generate_error_message(response_name,'payload.errorInfo.code is invalid',payload))
-
-    if response_name == 'RateLimitExceededError':
-        for required_key in ['rateLimit','timeUnit']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if not payload['rateLimit'].isdigit(): raise_value_error(generate_error_message(response_name,'payload.rateLimit must be a positive integer',payload))
-        if payload['timeUnit'] not in VALID_TIME_UNITS: raise_value_error(generate_error_message(response_name,'payload.timeUnit is invalid',payload))
-
-    if response_name == 'NotSupportedInCurrentModeError':
-        required_key = 'currentDeviceMode'
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if payload[required_key] not in VALID_CURRENT_DEVICE_MODES: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is invalid',payload))
-
-    if response_name == 'UnexpectedInformationReceivedError':
-        required_key = 'faultingParameter'
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if is_empty_string(payload[required_key]): raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' must not be empty',payload))
+        if not bool(payload): _fail(response_name,'payload must not be empty',payload)
+
+    # Validate payload contents specific to the response
+    validator = _CONTROL_PAYLOAD_VALIDATORS.get(response_name)
+    if validator is not None: validator(response_name,payload)
 
 def validateQueryResponse(request,response):
     """Validate the response to a Query request.
@@ -468,136 +457,264 @@ def validateQueryResponse(request,response):
     """
 
     # Validate header
-    validateResponseHeader(request,response)
-    response_name = response['header']['name']
+    response_name = validateResponseHeader(request,response)
 
     # Validate response payload
-    try:
-        payload = response['payload']
-    except:
-        raise_value_error(generate_error_message(response_name,'payload is missing',response))
+    if 'payload' not in response: _fail(response_name,'payload is missing',response)
+    payload = response['payload']
 
-    if payload is None: raise_value_error(generate_error_message(response_name,'payload is missing',payload))
-    if not isinstance(payload,dict): raise_value_error(generate_error_message(response_name,'payload must be a dict',payload))
+    if payload is None: _fail(response_name,'payload is missing',payload)
+    if not isinstance(payload,dict): _fail(response_name,'payload must be a dict',payload)
 
     # Validate non-empty control response payload
     if response_name not in VALID_NON_EMPTY_PAYLOAD_RESPONSE_NAMES:
-        if bool(payload): raise_value_error(generate_error_message(response_name,'payload must be empty',payload))
+        if bool(payload): _fail(response_name,'payload must be empty',payload)
     else:
-        if not bool(payload): raise_value_error(generate_error_message(response_name,'payload must not be empty',payload))
-
-    # Validate thermostat query response payload
-    if response_name in 'GetTemperatureReadingResponse':
-        for required_key in ['temperatureReading']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if 'value' not in payload['temperatureReading']: raise_value_error(generate_error_message(response_name,'payload.temperatureReading.value is missing',payload))
-        if not is_number(payload['temperatureReading']['value']): raise_value_error(generate_error_message(response_name,'payload.temperatureReading.value must be a number',payload))
-
-    if response_name in 'GetTargetTemperatureResponse':
-        for required_key in ['temperatureMode']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if 'value' not in payload['temperatureMode']: raise_value_error(generate_error_message(response_name,'payload.temperatureMode.value is missing',payload))
-        if payload['temperatureMode']['value'] not in VALID_TEMPERATURE_MODES: raise_value_error(generate_error_message(response_name,'payload.temperatureMode.value is invalid',payload))
-
-        mode = payload['temperatureMode']['value']
-
-        for optional_key in ['targetTemperature','coolingTargetTemperature','heatingTargetTemperature']:
-            if optional_key in payload:
-                if 'value' not in payload[optional_key]: raise_value_error(generate_error_message(response_name,'payload.' + optional_key + '.value is missing',payload))
-                if not is_number(payload[optional_key]['value']): raise_value_error(generate_error_message(response_name,'payload.' + optional_key + '.value must be a number',payload))
-
-        if mode == 'CUSTOM':
-            if 'friendlyName' not in payload['temperatureMode']: raise_value_error(generate_error_message(response_name,'payload.temperatureMode.friendlyName is missing',payload))
-            if is_empty_string(payload['temperatureMode']['friendlyName']): raise_value_error(generate_error_message(response_name,'payload.temperatureMode.friendlyName must not be empty',payload))
-
-    # Validate lock query response payload
-    if response_name in ['GetLockStateResponse']:
-        for required_key in ['lockState']:
-            if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        if payload['lockState'] not in VALID_LOCK_STATES: raise_value_error(generate_error_message(response_name,'payload.lockState is invalid',payload))
-
-    # Validate query error response payload
-    if response_name == 'UnableToGetValueError':
-        required_key = 'errorInfo'
-        if required_key not in payload: raise_value_error(generate_error_message(response_name,'payload.' + format(required_key) + ' is missing',payload))
-        for required_key in ['code','description']:
-            if required_key not in payload['errorInfo']: raise_value_error(generate_error_message(response_name,'payload.errorInfo' + format(required_key) + ' is missing',payload))
-        if payload['errorInfo']['code'] not in VALID_UNABLE_ERROR_INFO_CODES: raise_value_error(generate_error_message(response_name,'payload.errorInfo.code is invalid',payload))
+        if not bool(payload): _fail(response_name,'payload must not be empty',payload)
+
+    # Validate payload contents specific to the response
+    validator = _QUERY_PAYLOAD_VALIDATORS.get(response_name)
+    if validator is not None: validator(response_name,payload)
 
 def validateResponseHeader(request,response):
     """Validate the response header.
 
     This method validates the header of the responses, based on the API reference:
     https://developer.amazon.com/public/solutions/alexa/alexa-skills-kit/docs/smart-home-skill-api-reference#skill-adapter-directives
+
+    Returns the validated response name, so callers need not look it up again.
     """
 
     request_name = request['header']['name']
     header = response['header']
 
     # Validate if request_name is valid
-    if request_name not in VALID_REQUEST_NAMES: raise_value_error(generate_error_message('Request','request name is invalid',request))
+    if not is_one_of(request_name,VALID_REQUEST_NAMES): _fail('Request','request name is invalid',request)
 
     # Validate if header exists
-    if header is None: raise_value_error(generate_error_message('Response','response header is missing',response))
+    if header is None: _fail('Response','response header is missing',response)
 
     # Validate header required params
-    for required_header_key in REQUIRED_HEADER_KEYS:
-        if required_header_key not in header: raise_value_error(generate_error_message('Response','header.' + required_header_key + ' is required',header))
+    for required_key in REQUIRED_HEADER_KEYS:
+        if required_key not in header: _fail('Response',f'header.{required_key} is required',header)
+
+    namespace = header['namespace']
+    response_name = header['name']
+    payload_version = header['payloadVersion']
+    message_id = header['messageId']
 
     # Validate header namespace and name
-    if request_name in VALID_DISCOVERY_REQUEST_NAMES:
-        if header['namespace'] != 'Alexa.ConnectedHome.Discovery': raise_value_error(generate_error_message('Discovery Response','header.namespace must be Alexa.ConnectedHome.Discovery',header))
-        if header['name'] not in VALID_DISCOVERY_RESPONSE_NAMES: raise_value_error(generate_error_message('Discovery Response','header.name is invalid',header))
-        correct_response_name = request_name.replace('Request','Response')
-        if header['name'] != correct_response_name: raise_value_error(generate_error_message('Discovery Response','header.name must be ' + correct_response_name + ' for ' + request_name,header))
-
-    if request_name in VALID_CONTROL_REQUEST_NAMES:
-        if header['namespace'] not in ['Alexa.ConnectedHome.Query','Alexa.ConnectedHome.Control']: raise_value_error(generate_error_message('Control Response','header.namespace must be Alexa.ConnectedHome.Query or Alexa.ConnectedHome.Control',header))
-        if header['name'] not in VALID_CONTROL_RESPONSE_NAMES + VALID_CONTROL_ERROR_RESPONSE_NAMES: raise_value_error(generate_error_message('Control Response','header.name is invalid',header))
-        if header['name'] not in VALID_CONTROL_ERROR_RESPONSE_NAMES:
-            correct_response_name = request_name.replace('Request','Confirmation')
-            if header['name'] != correct_response_name: raise_value_error(generate_error_message('Control Response','header.name must be an error response name or ' + correct_response_name + ' for ' + request_name,header))
-
-    if request_name in VALID_QUERY_REQUEST_NAMES:
-        if header['namespace'] not in ['Alexa.ConnectedHome.Query','Alexa.ConnectedHome.Control']: raise_value_error(generate_error_message('Query Response','header.namespace must be Alexa.ConnectedHome.Query or Alexa.ConnectedHome.Control',header))
-        if header['name'] not in VALID_QUERY_RESPONSE_NAMES + VALID_CONTROL_ERROR_RESPONSE_NAMES: raise_value_error(generate_error_message('Query Response','header.name is invalid',header))
-        if header['name'] not in VALID_CONTROL_ERROR_RESPONSE_NAMES:
-            correct_response_name = request_name.replace('Request','Response')
-            if header['name'] != correct_response_name: raise_value_error(generate_error_message('Query Response','header.name must be an error response name or ' + correct_response_name + ' for ' + request_name,header))
-
-    if request_name in VALID_SYSTEM_REQUEST_NAMES:
-        if header['namespace'] != 'Alexa.ConnectedHome.System': raise_value_error(generate_error_message('System Response','header.namespace must be Alexa.ConnectedHome.System',header))
-        if header['name'] not in VALID_SYSTEM_RESPONSE_NAMES: raise_value_error(generate_error_message('System Response','header.name is invalid',header))
-        correct_response_name = request_name.replace('Request','Response')
-        if header['name'] != correct_response_name: raise_value_error(generate_error_message('System Response','header.name must be ' + correct_response_name + ' for ' + request_name,header))
+    rule = _RESPONSE_HEADER_RULES[request_name]
+    correct_response_name = _EXPECTED_RESPONSE_NAMES[request_name]
+    if not is_one_of(namespace,rule.namespaces): _fail(rule.title,rule.namespace_message,header)
+    if not is_one_of(response_name,rule.response_names): _fail(rule.title,'header.name is invalid',header)
+    if response_name not in rule.error_names and response_name != correct_response_name:
+        if rule.error_names: _fail(rule.title,f'header.name must be an error response name or {correct_response_name} for {request_name}',header)
+        _fail(rule.title,f'header.name must be {correct_response_name} for {request_name}',header)
 
     # Validate common header constraints
-    if header['payloadVersion'] != '2': raise_value_error(generate_error_message(header['name'],'header.payloadVersion must be \'2\' (string)',header))
-    if not re.match('^[a-zA-Z0-9\-]*$',header['messageId']): raise_value_error(generate_error_message(header['name'],'header.messageId must be specified in alphanumeric characters or - ',header))
-    if is_empty_string(header['messageId']): raise_value_error(generate_error_message(header['name'],'header.messageId must not be empty',header))
-    if len(header['messageId']) > 127: raise_value_error(generate_error_message(header['name'],'header.messageId must not exceed 127 characters',header))
+    if payload_version != '2': _fail(response_name,'header.payloadVersion must be \'2\' (string)',header)
+    if not is_message_id(message_id): _fail(response_name,'header.messageId must be specified in alphanumeric characters or - ',header)
+    if is_empty_string(message_id): _fail(response_name,'header.messageId must not be empty',header)
+    if len(message_id) > 127: _fail(response_name,'header.messageId must not exceed 127 characters',header)
+
+    return response_name
+
+
+_RESPONSE_VALIDATORS = {
+    'Alexa.ConnectedHome.Discovery': validateDiscoveryResponse,
+    'Alexa.ConnectedHome.Control': validateControlResponse,
+    'Alexa.ConnectedHome.Query': validateQueryResponse,
+    'Alexa.ConnectedHome.System': validateSystemResponse,
+}
+
+"""Payload validators, dispatched on the response name."""
+
+def _validate_color_payload(response_name,payload):
+    if 'achievedState' not in payload: _fail(response_name,'payload.achievedState is missing',payload)
+    achieved_state = payload['achievedState']
+    if 'color' not in achieved_state: _fail(response_name,'payload.achievedState.color is missing',payload)
+    color = achieved_state['color']
+    for required_key in ('hue','saturation','brightness'):
+        if required_key not in color: _fail(response_name,f'payload.achievedState.color.{required_key} is missing',payload)
+        if not is_number(color[required_key]): _fail(response_name,f'payload.achievedState.color.{required_key} must be a number',payload)
+    if color['hue'] < 0 or color['hue'] > 360: _fail(response_name,'payload.achievedState.color.hue must be between 0.00 and 360.00 inclusive',payload)
+    if color['saturation'] < 0 or color['saturation'] > 1: _fail(response_name,'payload.achievedState.color.saturation must be between 0.0000 and 1.0000 inclusive',payload)
+    if color['brightness'] < 0 or color['brightness'] > 1: _fail(response_name,'payload.achievedState.color.brightness must be between 0.0000 and 1.0000 inclusive',payload)
+
+def _validate_color_temperature_payload(response_name,payload):
+    if 'achievedState' not in payload: _fail(response_name,'payload.achievedState is missing',payload)
+    achieved_state = payload['achievedState']
+    if 'colorTemperature' not in achieved_state: _fail(response_name,'payload.achievedState.colorTemperature is missing',payload)
+    color_temperature = achieved_state['colorTemperature']
+    if 'value' not in color_temperature: _fail(response_name,'payload.achievedState.colorTemperature.value is missing',payload)
+    value = color_temperature['value']
+    if not isinstance(value, int): _fail(response_name,'payload.achievedState.colorTemperature.value must be an integer',payload)
+    if value < 1000 or value > 10000: _fail(response_name,'payload.achievedState.colorTemperature.value must be between 1000 and 10000 inclusive',payload)
+
+def _validate_target_temperature_confirmation_payload(response_name,payload):
+    for required_key in REQUIRED_TARGET_TEMPERATURE_CONFIRMATION_KEYS:
+        if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    target_temperature = payload['targetTemperature']
+    temperature_mode = payload['temperatureMode']
+    previous_state = payload['previousState']
+    if 'value' not in target_temperature: _fail(response_name,'payload.targetTemperature.value is missing',payload)
+    if not is_number(target_temperature['value']): _fail(response_name,'payload.targetTemperature.value must be a number',payload)
+    if 'value' not in temperature_mode: _fail(response_name,'payload.temperatureMode.value is missing',payload)
+    if not is_one_of(temperature_mode['value'],VALID_TEMPERATURE_MODES): _fail(response_name,'payload.temperatureMode.value is invalid',payload)
+
+    # Validate payload.previousState
+    for required_key in REQUIRED_PREVIOUS_STATE_KEYS:
+        if required_key not in previous_state: _fail(response_name,f'payload.previousState.{required_key} is missing',payload)
+    target_temperature = previous_state['targetTemperature']
+    temperature_mode = previous_state['temperatureMode']
+    if 'value' not in target_temperature: _fail(response_name,'payload.previousState.targetTemperature.value is missing',payload)
+    if not is_number(target_temperature['value']): _fail(response_name,'payload.previousState.targetTemperature.value must be a number',payload)
+    if 'value' not in temperature_mode: _fail(response_name,'payload.previousState.temperatureMode.value is missing',payload)
+    if not is_one_of(temperature_mode['value'],VALID_TEMPERATURE_MODES): _fail(response_name,'payload.previousState.temperatureMode.value is invalid',payload)
+
+def _validate_temperature_reading_payload(response_name,payload):
+    if 'temperatureReading' not in payload: _fail(response_name,'payload.temperatureReading is missing',payload)
+    temperature_reading = payload['temperatureReading']
+    if 'value' not in temperature_reading: _fail(response_name,'payload.temperatureReading.value is missing',payload)
+    if not is_number(temperature_reading['value']): _fail(response_name,'payload.temperatureReading.value must be a number',payload)
+
+def _validate_target_temperature_payload(response_name,payload):
+    if 'temperatureMode' not in payload: _fail(response_name,'payload.temperatureMode is missing',payload)
+    temperature_mode = payload['temperatureMode']
+    if 'value' not in temperature_mode: _fail(response_name,'payload.temperatureMode.value is missing',payload)
+    mode = temperature_mode['value']
+    if not is_one_of(mode,VALID_TEMPERATURE_MODES): _fail(response_name,'payload.temperatureMode.value is invalid',payload)
+
+    for optional_key in ('targetTemperature','coolingTargetTemperature','heatingTargetTemperature'):
+        if optional_key in payload:
+            if 'value' not in payload[optional_key]: _fail(response_name,f'payload.{optional_key}.value is missing',payload)
+            if not is_number(payload[optional_key]['value']): _fail(response_name,f'payload.{optional_key}.value must be a number',payload)
+
+    if mode == 'CUSTOM':
+        if 'friendlyName' not in temperature_mode: _fail(response_name,'payload.temperatureMode.friendlyName is missing',payload)
+        if is_empty_string(temperature_mode['friendlyName']): _fail(response_name,'payload.temperatureMode.friendlyName must not be empty',payload)
+
+def _validate_lock_state_payload(response_name,payload):
+    if 'lockState' not in payload: _fail(response_name,'payload.lockState is missing',payload)
+    if not is_one_of(payload['lockState'],VALID_LOCK_STATES): _fail(response_name,'payload.lockState is invalid',payload)
+
+def _validate_value_out_of_range_payload(response_name,payload):
+    for required_key in ('minimumValue','maximumValue'):
+        if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+        if not is_number(payload[required_key]): _fail(response_name,f'payload.{required_key} must be a number',payload)
+
+def _validate_dependent_service_payload(response_name,payload):
+    required_key = 'dependentServiceName'
+    if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    if not is_alphanumeric_and_spaces(payload[required_key]): _fail(response_name,f'payload.{required_key} must be specified in alphanumeric characters and spaces',payload)
+
+def _validate_firmware_outdated_payload(response_name,payload):
+    for required_key in ('minimumFirmwareVersion','currentFirmwareVersion'):
+        if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+        if is_empty_string(payload[required_key]): _fail(response_name,f'payload.{required_key} must not be empty',payload)
+        if not is_alphanumeric(payload[required_key]): _fail(response_name,f'payload.{required_key} must be specified in alphanumeric characters',payload)
+
+def _validate_unable_error_info_payload(response_name,payload):
+    required_key = 'errorInfo'
+    if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    error_info = payload['errorInfo']
+    for required_key in REQUIRED_ERROR_INFO_KEYS:
+        if required_key not in error_info: _fail(response_name,f'payload.errorInfo{required_key} is missing',payload)
+    if not is_one_of(error_info['code'],VALID_UNABLE_ERROR_INFO_CODES): _fail(response_name,'payload.errorInfo.code is invalid',payload)
+
+def _validate_unwilling_error_info_payload(response_name,payload):
+    required_key = 'errorInfo'
+    if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    error_info = payload['errorInfo']
+    for required_key in REQUIRED_ERROR_INFO_KEYS:
+        if required_key not in error_info: _fail(response_name,f'payload.errorInfo{required_key} is missing',payload)
+    if not is_one_of(error_info['code'],VALID_UNWILLING_ERROR_INFO_CODES): _fail(response_name,'payload.errorInfo.code is invalid',payload)
+
+def _validate_rate_limit_payload(response_name,payload):
+    for required_key in REQUIRED_RATE_LIMIT_KEYS:
+        if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    if not is_integer_string(payload['rateLimit']): _fail(response_name,'payload.rateLimit must be a positive integer',payload)
+    if not is_one_of(payload['timeUnit'],VALID_TIME_UNITS): _fail(response_name,'payload.timeUnit is invalid',payload)
+
+def _validate_current_device_mode_payload(response_name,payload):
+    required_key = 'currentDeviceMode'
+    if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    if not is_one_of(payload[required_key],VALID_CURRENT_DEVICE_MODES): _fail(response_name,f'payload.{required_key} is invalid',payload)
+
+def _validate_faulting_parameter_payload(response_name,payload):
+    required_key = 'faultingParameter'
+    if required_key not in payload: _fail(response_name,f'payload.{required_key} is missing',payload)
+    if is_empty_string(payload[required_key]): _fail(response_name,f'payload.{required_key} must not be empty',payload)
+
+_CONTROL_PAYLOAD_VALIDATORS = {
+    'SetColorConfirmation': _validate_color_payload,
+    'SetColorTemperatureConfirmation': _validate_color_temperature_payload,
+    'IncrementColorTemperatureConfirmation': _validate_color_temperature_payload,
+    'DecrementColorTemperatureConfirmation': _validate_color_temperature_payload,
+    'SetTargetTemperatureConfirmation': _validate_target_temperature_confirmation_payload,
+    'IncrementTargetTemperatureConfirmation': _validate_target_temperature_confirmation_payload,
+    'DecrementTargetTemperatureConfirmation': _validate_target_temperature_confirmation_payload,
+    'SetLockStateConfirmation': _validate_lock_state_payload,
+    'ValueOutOfRangeError': _validate_value_out_of_range_payload,
+    'DependentServiceUnavailableError': _validate_dependent_service_payload,
+    'TargetFirmwareOutdatedError': _validate_firmware_outdated_payload,
+    'TargetBridgeFirmwareOutdatedError': _validate_firmware_outdated_payload,
+    'UnableToSetValueError': _validate_unable_error_info_payload,
+    'UnableToGetValueError': _validate_unable_error_info_payload,
+    'UnwillingToSetValueError': _validate_unwilling_error_info_payload,
+    'RateLimitExceededError': _validate_rate_limit_payload,
+    'NotSupportedInCurrentModeError': _validate_current_device_mode_payload,
+    'UnexpectedInformationReceivedError': _validate_faulting_parameter_payload,
+}
+
+_QUERY_PAYLOAD_VALIDATORS = {
+    'GetTemperatureReadingResponse': _validate_temperature_reading_payload,
+    'GetTargetTemperatureResponse': _validate_target_temperature_payload,
+    'GetLockStateResponse': _validate_lock_state_payload,
+    'UnableToGetValueError': _validate_unable_error_info_payload,
+}
 
 
 """Utility functions."""
 
 def is_number(s):
-    try:
-        float(s)
-        return True
-    except ValueError:
-        return False
+    # JSON numbers only, as in the Node.js validator; bool is a subclass of int but is not a number here
+    return isinstance(s,(int,float)) and not isinstance(s,bool)
+
+def is_integer_string(s):
+    # ASCII digits only: str.isdigit alone also accepts characters such as '²' that int() rejects
+    return isinstance(s,str) and s.isascii() and s.isdigit()
+
+def is_one_of(value,valid_values):
+    # only strings are valid, which also keeps unhashable values (dicts, lists) out of the set lookup
+    return isinstance(value,str) and value in valid_values
 
 def is_alphanumeric_and_spaces(s):
-    return re.match('^[a-zA-Z0-9äüöÄÜÖß ]*$',s)
+    return ALPHANUMERIC_AND_SPACES_PATTERN.fullmatch(s) is not None
 
 def is_alphanumeric(s):
-    return re.match('^[a-zA-Z0-9äüöÄÜÖß]*$',s)
+    return ALPHANUMERIC_PATTERN.fullmatch(s) is not None
+
+def is_appliance_id(s):
+    return APPLIANCE_ID_PATTERN.fullmatch(s) is not None
+
+def is_message_id(s):
+    return MESSAGE_ID_PATTERN.fullmatch(s) is not None
+
+def json_size(data):
+    # size of the compact JSON encoding; non-ASCII is escaped by default, so characters and bytes are the same count
+    return len(COMPACT_JSON_ENCODER.encode(data))
 
 def is_empty_string(s):
-    return len(str(s).strip()) == 0
+    if not isinstance(s,str): s = str(s)
+    return not s or s.isspace()
 
 def raise_value_error(message):
     raise ValueError(message)
 
 def generate_error_message(title,message,data):
-    return title + ' :: ' + message + ': ' + format(data)
+    return f'{title} :: {message}: {data}'
+
+def _fail(title,message,data):
+    raise ValueError(generate_error_message(title,message,data))